@@ -4,20 +4,109 @@ Distant Reading Analysis Script for Architecture Texts
 Performs sentiment analysis, topic modeling, and style metrics on Project Gutenberg texts.
 """
 
+import argparse
 import os
-import json
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
+from gensim.matutils import Sparse2Corpus, corpus2dense
+from gensim.models import LdaModel
 import textstat
 import numpy as np
+import orjson
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# Word-like tokens, keeping internal hyphens and apostrophes attached
+_TOKEN_RE = re.compile(r"\w+(?:[-']\w+)*")
+# Contraction suffixes that word_tokenize splits off as their own token
+_CLITIC_RE = re.compile(r"(?:n't|'(?:s|m|d|ll|re|ve))$")
+
+
+@lru_cache(maxsize=None)
+def _get_stop_words():
+    """Return the English stopwords, loaded from NLTK once per process."""
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=None)
+def _get_sentiment_analyzer():
+    """Return a VADER analyzer, parsing its lexicon once per process."""
+    return SentimentIntensityAnalyzer()
+
+
+def _read_text(path):
+    """Read a text file, returning (book name, contents)."""
+    with open(path, 'rb') as f:
+        content = f.read().decode('utf-8', errors='ignore')
+    return os.path.basename(path)[:-len('.txt')], content
+
+
+def _write_json(path, obj):
+    """Serialize obj as indented JSON to path and return the path."""
+    options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    path.write_bytes(orjson.dumps(obj, option=options))
+    return path
+
+
+def _strip_gutenberg_markers(text):
+    """Remove every ``***...***`` span, as the Gutenberg header/footer markers.
+
+    Equivalent to a non-greedy DOTALL regex substitution, but uses
+    str.find so large books are scanned by a literal substring search.
+    """
+    pieces = []
+    pos = 0
+    while True:
+        start = text.find('***', pos)
+        if start == -1:
+            break
+        end = text.find('***', start + 3)
+        if end == -1:
+            break
+        pieces.append(text[pos:start])
+        pos = end + 3
+    if not pieces:
+        return text
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+
+def _fast_words(text):
+    """Split text into lowercase alphabetic words.
+
+    Approximates word_tokenize followed by an isalpha() filter, much
+    faster: contractions keep their stem ("don't" -> "do", "architect's"
+    -> "architect"), while hyphenated, underscored or alphanumeric tokens
+    are dropped.
+    """
+    words = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if not token.isalpha():
+            token = _CLITIC_RE.sub('', token)
+            if not token.isalpha():
+                continue
+        words.append(token)
+    return words
+
+
+def _word_stats(words):
+    """Return (count, total length, unique count) of the words in one pass."""
+    total_length = 0
+    unique = set()
+    for w in words:
+        total_length += len(w)
+        unique.add(w)
+    return len(words), total_length, len(unique)
 
 
 class DistantReadingAnalyzer:
@@ -26,13 +115,6 @@ class DistantReadingAnalyzer:
     def __init__(self, texts_dir='texts', output_dir='data'):
         self.texts_dir = Path(texts_dir)
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-
-        # Initialize NLTK data
-        self._download_nltk_data()
-
-        # Initialize sentiment analyzer
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
 
         # Store processed texts
         self.texts = {}
@@ -50,85 +132,146 @@ class DistantReadingAnalyzer:
     def load_texts(self):
         """Load all text files from the texts directory."""
         print("Loading texts...")
-        for file_path in self.texts_dir.glob('*.txt'):
-            book_name = file_path.stem
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            self.texts[book_name] = content
-            print(f"  Loaded: {book_name}")
+        with os.scandir(self.texts_dir) as entries:
+            file_paths = [
+                entry.path for entry in entries
+                if entry.name.endswith('.txt') and entry.is_file()
+            ]
+
+        # Read files on worker threads while cleaning on the main thread
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for book_name, content in executor.map(_read_text, file_paths):
+                # Keep only the cleaned text so the raw file is not held in memory
+                self.texts[book_name] = self.clean_text(content)
+                print(f"  Loaded: {book_name}")
 
     def clean_text(self, text):
         """Clean and preprocess text."""
         # Remove Project Gutenberg headers/footers
-        text = re.sub(r'\*\*\*.*?\*\*\*', '', text, flags=re.DOTALL)
+        text = _strip_gutenberg_markers(text)
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         return text.strip()
 
-    def analyze_sentiment(self, text):
-        """Analyze sentiment using VADER."""
-        sentences = sent_tokenize(text)
-        sentiments = []
+    def polarity_scores_batch(self, sentences):
+        """Score a batch of sentences with VADER as an (N, 4) array.
+
+        Columns are positive, negative, neutral and compound scores.
+        """
+        polarity_scores = _get_sentiment_analyzer().polarity_scores
+        scores = np.empty((len(sentences), 4), dtype=np.float64)
+        for i, sentence in enumerate(sentences):
+            s = polarity_scores(sentence)
+            scores[i] = (s['pos'], s['neg'], s['neu'], s['compound'])
+        return scores
+
+    def analyze_sentiment(self, text, sentences=None):
+        """Analyze sentiment using VADER.
 
-        for sentence in sentences:
-            scores = self.sentiment_analyzer.polarity_scores(sentence)
-            sentiments.append(scores)
+        Pass precomputed sentences to avoid tokenizing text again.
+        """
+        if sentences is None:
+            sentences = sent_tokenize(text)
 
         # Aggregate sentiment scores
-        if sentiments:
-            avg_sentiment = {
-                'positive': np.mean([s['pos'] for s in sentiments]),
-                'negative': np.mean([s['neg'] for s in sentiments]),
-                'neutral': np.mean([s['neu'] for s in sentiments]),
-                'compound': np.mean([s['compound'] for s in sentiments])
-            }
+        if sentences:
+            means = self.polarity_scores_batch(sentences).mean(axis=0)
+            avg_sentiment = dict(zip(
+                ('positive', 'negative', 'neutral', 'compound'),
+                means.tolist()
+            ))
         else:
             avg_sentiment = {'positive': 0, 'negative': 0, 'neutral': 0, 'compound': 0}
 
         return avg_sentiment
 
-    def calculate_style_metrics(self, text):
-        """Calculate various style and readability metrics."""
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text.lower())
+    def calculate_style_metrics(self, text, sentences=None, words=None):
+        """Calculate various style and readability metrics.
 
-        # Filter to only alphabetic words
-        words_alpha = [w for w in words if w.isalpha()]
+        Pass precomputed sentences and words to avoid tokenizing text again.
+        """
+        if sentences is None:
+            sentences = sent_tokenize(text)
+        if words is None:
+            words = _fast_words(text)
+
+        n_words, total_length, n_unique = _word_stats(words)
 
         metrics = {
             'flesch_reading_ease': textstat.flesch_reading_ease(text),
             'flesch_kincaid_grade': textstat.flesch_kincaid_grade(text),
-            'avg_sentence_length': len(words_alpha) / len(sentences) if sentences else 0,
-            'avg_word_length': np.mean([len(w) for w in words_alpha]) if words_alpha else 0,
-            'lexical_diversity': len(set(words_alpha)) / len(words_alpha) if words_alpha else 0,
-            'total_words': len(words_alpha),
+            'avg_sentence_length': n_words / len(sentences) if sentences else 0,
+            'avg_word_length': total_length / n_words if n_words else 0,
+            'lexical_diversity': n_unique / n_words if n_words else 0,
+            'total_words': n_words,
             'total_sentences': len(sentences),
-            'unique_words': len(set(words_alpha))
+            'unique_words': n_unique
         }
 
         return metrics
 
-    def get_word_frequencies(self, text, top_n=50):
-        """Get word frequency counts for word cloud generation."""
-        words = word_tokenize(text.lower())
-        words_alpha = [w for w in words if w.isalpha() and len(w) > 3]
+    def get_word_frequencies(self, text, top_n=50, words=None):
+        """Get word frequency counts for word cloud generation.
 
-        # Remove stopwords
-        stop_words = set(stopwords.words('english'))
-        words_filtered = [w for w in words_alpha if w not in stop_words]
+        Pass precomputed words to avoid tokenizing text again.
+        """
+        if words is None:
+            words = _fast_words(text)
 
-        # Count frequencies
-        word_freq = Counter(words_filtered)
+        # Count frequencies, skipping short words and stopwords
+        stop_words = _get_stop_words()
+        word_freq = Counter(w for w in words if len(w) > 3 and w not in stop_words)
         top_words = dict(word_freq.most_common(top_n))
 
         return top_words
 
-    def perform_topic_modeling(self, n_topics=5, n_top_words=10):
-        """Perform LDA topic modeling on all texts."""
+    def _fit_lda_sklearn(self, doc_term_matrix, n_topics, n_documents):
+        """Fit scikit-learn LDA, returning topic-word and doc-topic arrays."""
+        lda = LatentDirichletAllocation(
+            n_components=n_topics,
+            random_state=42,
+            max_iter=20,
+            learning_method='online',
+            batch_size=max(128, n_documents // 4),
+            evaluate_every=-1,
+            n_jobs=-1
+        )
+
+        doc_topic_dist = lda.fit_transform(doc_term_matrix)
+        return lda.components_, doc_topic_dist
+
+    def _fit_lda_gensim(self, doc_term_matrix, feature_names, n_topics):
+        """Fit gensim LDA, returning topic-word and doc-topic arrays.
+
+        Uses the single-process LdaModel: LdaMulticore merges worker
+        updates in completion order, so its topics are not reproducible
+        even with a fixed random_state.
+        """
+        corpus = Sparse2Corpus(doc_term_matrix, documents_columns=False)
+        id2word = dict(enumerate(feature_names))
+
+        lda = LdaModel(
+            corpus=corpus,
+            id2word=id2word,
+            num_topics=n_topics,
+            passes=5,
+            random_state=42
+        )
+
+        doc_topics = lda.get_document_topics(corpus, minimum_probability=0)
+        doc_topic_dist = corpus2dense(doc_topics, num_terms=n_topics).T
+        return lda.get_topics(), doc_topic_dist
+
+    def perform_topic_modeling(self, n_topics=5, n_top_words=10, backend='gensim'):
+        """Perform LDA topic modeling on all texts.
+
+        backend selects the LDA implementation: 'gensim' (LdaModel)
+        or 'sklearn' (LatentDirichletAllocation).
+        """
         print("Performing topic modeling...")
 
         # Prepare documents
-        documents = [self.clean_text(text) for text in self.texts.values()]
+        documents = list(self.texts.values())
         book_names = list(self.texts.keys())
 
         # Create document-term matrix
@@ -136,26 +279,38 @@ class DistantReadingAnalyzer:
             max_df=0.95,
             min_df=2,
             stop_words='english',
-            max_features=1000
+            max_features=1000,
+            dtype=np.float32
         )
 
         doc_term_matrix = vectorizer.fit_transform(documents)
+        feature_names = vectorizer.get_feature_names_out()
 
-        # Perform LDA
-        lda = LatentDirichletAllocation(
-            n_components=n_topics,
-            random_state=42,
-            max_iter=20
-        )
+        # Only the feature labels are needed from here on; release the
+        # vectorizer (including its stop_words_ set of every pruned term)
+        # before fitting LDA
+        del vectorizer
 
-        lda.fit(doc_term_matrix)
+        # Perform LDA
+        if backend == 'gensim':
+            topic_word, doc_topic_dist = self._fit_lda_gensim(
+                doc_term_matrix, feature_names, n_topics
+            )
+        elif backend == 'sklearn':
+            topic_word, doc_topic_dist = self._fit_lda_sklearn(
+                doc_term_matrix, n_topics, len(book_names)
+            )
+        else:
+            raise ValueError(f"Unknown topic modeling backend: {backend!r}")
 
         # Extract topics
-        feature_names = vectorizer.get_feature_names_out()
         topics = []
 
-        for topic_idx, topic in enumerate(lda.components_):
-            top_words_idx = topic.argsort()[-n_top_words:][::-1]
+        n_top = min(n_top_words, len(feature_names))
+        for topic_idx, topic in enumerate(topic_word):
+            # Select the top words in linear time, then sort only those
+            top_part = np.argpartition(topic, -n_top)[-n_top:]
+            top_words_idx = top_part[np.argsort(topic[top_part])[::-1]]
             top_words = [feature_names[i] for i in top_words_idx]
             topics.append({
                 'topic_id': topic_idx,
@@ -163,19 +318,17 @@ class DistantReadingAnalyzer:
                 'weights': [float(topic[i]) for i in top_words_idx]
             })
 
-        # Get document-topic distribution
-        doc_topic_dist = lda.transform(doc_term_matrix)
-
         # Map documents to dominant topics
-        doc_topics = []
-        for i, book_name in enumerate(book_names):
-            topic_dist = doc_topic_dist[i]
-            dominant_topic = int(np.argmax(topic_dist))
-            doc_topics.append({
+        dominant_topics = doc_topic_dist.argmax(axis=1).tolist()
+        topic_dists = doc_topic_dist.tolist()
+        doc_topics = [
+            {
                 'book': book_name,
-                'dominant_topic': dominant_topic,
-                'topic_distribution': [float(x) for x in topic_dist]
-            })
+                'dominant_topic': dominant_topics[i],
+                'topic_distribution': topic_dists[i]
+            }
+            for i, book_name in enumerate(book_names)
+        ]
 
         return {
             'topics': topics,
@@ -183,28 +336,45 @@ class DistantReadingAnalyzer:
             'n_topics': n_topics
         }
 
-    def analyze_all_texts(self):
-        """Perform complete analysis on all texts."""
-        print("\nAnalyzing texts...")
+    def analyze_book(self, book_name, text):
+        """Run sentiment, style and word frequency analysis on one cleaned book."""
+        print(f"\n  Analyzing: {book_name}")
 
-        for book_name, text in self.texts.items():
-            print(f"\n  Analyzing: {book_name}")
-            cleaned_text = self.clean_text(text)
+        # Tokenize once and share the tokens across analyses
+        sentences = sent_tokenize(text)
+        words = _fast_words(text)
 
-            # Perform analyses
-            sentiment = self.analyze_sentiment(cleaned_text)
-            style_metrics = self.calculate_style_metrics(cleaned_text)
-            word_freq = self.get_word_frequencies(cleaned_text)
+        # Perform analyses
+        sentiment = self.analyze_sentiment(text, sentences)
+        style_metrics = self.calculate_style_metrics(text, sentences, words)
+        word_freq = self.get_word_frequencies(text, words=words)
 
-            self.analysis_results[book_name] = {
-                'title': book_name,
-                'sentiment': sentiment,
-                'style_metrics': style_metrics,
-                'word_frequencies': word_freq
-            }
+        return {
+            'title': book_name,
+            'sentiment': sentiment,
+            'style_metrics': style_metrics,
+            'word_frequencies': word_freq
+        }
+
+    def analyze_all_texts(self, topic_backend='gensim'):
+        """Perform complete analysis on all texts.
+
+        topic_backend is passed to perform_topic_modeling as its backend.
+        """
+        print("\nAnalyzing texts...")
+
+        # Books are independent, so analyze them in parallel worker processes
+        max_workers = max(1, min(os.cpu_count() or 1, len(self.texts)))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(str(self.texts_dir), str(self.output_dir))
+        ) as executor:
+            for book_name, results in executor.map(_analyze_book, self.texts.items()):
+                self.analysis_results[book_name] = results
 
         # Perform topic modeling on entire corpus
-        topic_results = self.perform_topic_modeling()
+        topic_results = self.perform_topic_modeling(backend=topic_backend)
 
         return topic_results
 
@@ -212,34 +382,30 @@ class DistantReadingAnalyzer:
         """Save analysis results to JSON files."""
         print("\nSaving results...")
 
-        # Save individual book analyses
-        all_books = []
-        for book_name, results in self.analysis_results.items():
-            all_books.append(results)
-
-            # Save individual book file
-            output_file = self.output_dir / f'{book_name}.json'
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2)
-            print(f"  Saved: {output_file}")
+        # Save individual book files concurrently
+        all_books = list(self.analysis_results.values())
+        book_files = [
+            self.output_dir / f'{book_name}.json'
+            for book_name in self.analysis_results
+        ]
+        with ThreadPoolExecutor() as executor:
+            for output_file in executor.map(_write_json, book_files, all_books):
+                print(f"  Saved: {output_file}")
 
         # Save combined results
         combined_file = self.output_dir / 'all_books.json'
-        with open(combined_file, 'w', encoding='utf-8') as f:
-            json.dump(all_books, f, indent=2)
+        _write_json(combined_file, all_books)
         print(f"  Saved: {combined_file}")
 
         # Save topic modeling results
         topic_file = self.output_dir / 'topics.json'
-        with open(topic_file, 'w', encoding='utf-8') as f:
-            json.dump(topic_results, f, indent=2)
+        _write_json(topic_file, topic_results)
         print(f"  Saved: {topic_file}")
 
         # Create comparative metrics
         comparative = self._create_comparative_metrics()
         comparative_file = self.output_dir / 'comparative.json'
-        with open(comparative_file, 'w', encoding='utf-8') as f:
-            json.dump(comparative, f, indent=2)
+        _write_json(comparative_file, comparative)
         print(f"  Saved: {comparative_file}")
 
     def _create_comparative_metrics(self):
@@ -276,14 +442,18 @@ class DistantReadingAnalyzer:
 
         return comparative
 
-    def run(self):
+    def run(self, topic_backend='gensim'):
         """Run the complete analysis pipeline."""
         print("=" * 60)
         print("Distant Reading Analysis - Architecture Texts")
         print("=" * 60)
 
+        # Prepare NLTK data and the output directory
+        self._download_nltk_data()
+        self.output_dir.mkdir(exist_ok=True)
+
         self.load_texts()
-        topic_results = self.analyze_all_texts()
+        topic_results = self.analyze_all_texts(topic_backend)
         self.save_results(topic_results)
 
         print("\n" + "=" * 60)
@@ -291,6 +461,31 @@ class DistantReadingAnalyzer:
         print("=" * 60)
 
 
+# Per-process analyzer used by the worker pool in analyze_all_texts
+_worker_analyzer = None
+
+
+def _init_worker(texts_dir, output_dir):
+    """Build the worker's own analyzer so nothing heavy is pickled."""
+    global _worker_analyzer
+    _worker_analyzer = DistantReadingAnalyzer(texts_dir, output_dir)
+
+
+def _analyze_book(item):
+    """Analyze a (book_name, text) pair in a worker process."""
+    book_name, text = item
+    return book_name, _worker_analyzer.analyze_book(book_name, text)
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--topic-backend',
+        choices=['gensim', 'sklearn'],
+        default='gensim',
+        help="LDA implementation for topic modeling"
+    )
+    args = parser.parse_args()
+
     analyzer = DistantReadingAnalyzer()
-    analyzer.run()
+    analyzer.run(topic_backend=args.topic_backend)